@@ -1,60 +1,199 @@
 # solana_dex_bot.py
 import os
-import time
+import contextlib
+import logging
 import aiohttp
-import sqlite3
+import aiosqlite
 import asyncio
+import orjson
+from async_lru import alru_cache
 from datetime import datetime
 from typing import Dict, Any
+from urllib.parse import urlsplit
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import (
-    Updater, CommandHandler, CallbackQueryHandler,
-    MessageHandler, Filters, CallbackContext
+    AIORateLimiter, Application, CommandHandler, CallbackQueryHandler,
+    MessageHandler, filters, ContextTypes
 )
-from solana.rpc.api import Client
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+import uvicorn
+from solana.rpc.async_api import AsyncClient
 from solana.rpc.commitment import Confirmed
+from solana.rpc.websocket_api import connect
 from solders.keypair import Keypair
-from spl.token.client import Token
+from solders.pubkey import Pubkey
+from solders.rpc.responses import SubscriptionError, SubscriptionResult
+from websockets.exceptions import WebSocketException
+from aiosqlitepool import SQLiteConnectionPool
 from dotenv import load_dotenv
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+# Constant SQL text lets each connection reuse its compiled statement
+_INSERT_TOKEN_SQL = (
+    'INSERT OR REPLACE INTO tokens (address, symbol, liquidity, volume, mint_authority, '
+    'freeze_authority, created_at, risk_status) VALUES (?, ?, ?, ?, ?, ?, ?, ?)'
+)
+
+_TOKEN_PROGRAM = 'TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA'
+_TOKEN_2022_PROGRAM = 'TokenzQdBNbLqP5VEhdkAS6EPFLC1PHnBqCXEpPxuEb'
+
+# Static keyboards are built once at import
+_START_MARKUP = InlineKeyboardMarkup([
+    [InlineKeyboardButton("🔄 SOL Swap", callback_data='swap')],
+    [InlineKeyboardButton("📈 Token Analytics", callback_data='analyze')]
+])
+# Telegram rejects URL buttons pointing at local hosts, so only link a public dashboard
+_ANALYTICS_URL = os.getenv('ANALYTICS_URL')
+_ANALYTICS_MARKUP = None
+if _ANALYTICS_URL and urlsplit(_ANALYTICS_URL).hostname not in ('localhost', '127.0.0.1'):
+    _ANALYTICS_MARKUP = InlineKeyboardMarkup([
+        [InlineKeyboardButton("Open Dashboard", url=_ANALYTICS_URL)]
+    ])
+
 class SolanaDexBot:
     def __init__(self):
         self.config = {
             'rpc_url': os.getenv('SOLANA_RPC'),
+            'ws_url': os.getenv('SOLANA_WS', (os.getenv('SOLANA_RPC') or '').replace('http', 'ws', 1)),
             'dex_programs': {
                 'raydium': '675kPX9MHTjS2zt1qfr1NYHuzeLXfQM9H24wFSUt1Mp8',
                 'orca': '9W959DqEETiGZocYWCQPaJ6sBmUzgfxXfqGeTEdap3XV'
             },
             'jupiter_api': 'https://quote-api.jup.ag/v6',
+            'watchlist': [a for a in os.getenv('WATCHLIST', '').split(',') if a],
+            'poll_interval': 300,
+            'dashboard_port': int(os.getenv('DASHBOARD_PORT', 5000)),
+            'db_path': 'dexbot.db',
+            'db_pool_size': 8,  # readers; writes use their own connection
             'risk_params': {
                 'min_liquidity': 5000,
-                'max_creator_burns': 3,
                 'verified_programs': True
             }
         }
-        
-        self.db = sqlite3.connect('dexbot.db')
-        self._init_db()
-        self.client = Client(self.config['rpc_url'])
+
+        self._verified_programs = frozenset(self.config['dex_programs'].values())
+        self._pool = None
+        self._writer = None
+        self._write_lock = asyncio.Lock()
+        self.client = AsyncClient(self.config['rpc_url'])
         self.security = SecurityManager()
+        self._http = None
+        self._fetch_slots = asyncio.Semaphore(32)
+
+    async def _ensure_http(self) -> aiohttp.ClientSession:
+        """Shared HTTP session, created lazily inside the running loop"""
+        if self._http is None or self._http.closed:
+            self._http = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=100, limit_per_host=32, ttl_dns_cache=300, keepalive_timeout=60
+                ),
+                timeout=aiohttp.ClientTimeout(total=10),
+                json_serialize=lambda obj: orjson.dumps(obj).decode()
+            )
+        return self._http
+
+    async def open(self):
+        """Open the writer and reader pool; call once from the running loop"""
+        # SQLite allows one writer at a time, so writes share a dedicated connection
+        self._writer = await self._connect_db()
+        await self._init_db()
+        self._pool = SQLiteConnectionPool(
+            self._connect_db, pool_size=self.config['db_pool_size']
+        )
+
+    async def close(self):
+        """Release pooled connections on shutdown"""
+        if self._http is not None and not self._http.closed:
+            await self._http.close()
+        if self._pool is not None:
+            await self._pool.close()
+        if self._writer is not None:
+            await self._writer.close()
+        await self.client.close()
+
+    async def _connect_db(self) -> aiosqlite.Connection:
+        conn = await aiosqlite.connect(
+            self.config['db_path'], isolation_level=None, cached_statements=1024
+        )
+        # journal_mode is stored in the file, the rest are per-connection
+        await conn.execute('PRAGMA journal_mode=WAL')
+        await conn.execute('PRAGMA synchronous=NORMAL')
+        await conn.execute('PRAGMA temp_store=MEMORY')
+        await conn.execute('PRAGMA mmap_size=268435456')
+        return conn
 
-    def _init_db(self):
-        cursor = self.db.cursor()
-        cursor.execute('''CREATE TABLE IF NOT EXISTS tokens
-            (address TEXT PRIMARY KEY,
-             symbol TEXT,
-             liquidity REAL,
-             volume REAL,
-             creator_burns INTEGER,
-             created_at DATETIME,
-             risk_status TEXT)''')
-        self.db.commit()
+    async def _init_db(self):
+        async with self._write_lock:
+            await self._writer.execute('''CREATE TABLE IF NOT EXISTS tokens
+                (address TEXT PRIMARY KEY,
+                 symbol TEXT,
+                 liquidity REAL,
+                 volume REAL,
+                 mint_authority INTEGER,
+                 freeze_authority INTEGER,
+                 created_at DATETIME,
+                 risk_status TEXT)''')
+            # Tables created before the mint fields existed lack these columns
+            cursor = await self._writer.execute('PRAGMA table_info(tokens)')
+            columns = {row[1] for row in await cursor.fetchall()}
+            for column in ('mint_authority', 'freeze_authority'):
+                if column not in columns:
+                    await self._writer.execute(f'ALTER TABLE tokens ADD COLUMN {column} INTEGER')
+
+    async def recent_tokens(self, limit: int = 100) -> list:
+        async with self._pool.connection() as conn:
+            cursor = await conn.execute(
+                'SELECT * FROM tokens ORDER BY created_at DESC LIMIT ?', (limit,)
+            )
+            columns = [c[0] for c in cursor.description]
+            return [dict(zip(columns, row)) for row in await cursor.fetchall()]
+
+    async def save_tokens(self, analyses: list):
+        """Persist one cycle of analyses in a single transaction"""
+        if not analyses:
+            return
+        rows = [
+            (a['address'], a['symbol'], a['liquidity'], a['volume'],
+             a['mint_authority'], a['freeze_authority'], a['created_at'].isoformat(),
+             a['rug_risk'])
+            for a in analyses
+        ]
+        async with self._write_lock:
+            await self._writer.execute('BEGIN')
+            try:
+                await self._writer.executemany(_INSERT_TOKEN_SQL, rows)
+                await self._writer.execute('COMMIT')
+            except BaseException:
+                # Covers a failed COMMIT and cancellation, not just bad rows;
+                # SQLite may already have rolled back on errors like SQLITE_FULL
+                if self._writer.in_transaction:
+                    await self._writer.execute('ROLLBACK')
+                raise
 
     async def analyze_token(self, token_address: str) -> Dict[str, Any]:
         """Comprehensive Solana token analysis"""
-        token_data = await self._fetch_token_data(token_address)
+        token_data = (await self._fetch_token_data([token_address]))[0]
+        if isinstance(token_data, Exception):
+            raise token_data
+        return self._analyze(token_data)
+
+    async def analyze_tokens(self, addresses) -> list:
+        """Analyze several tokens sharing one batched chain read; failures are skipped"""
+        addresses = list(addresses)
+        results = []
+        for address, token_data in zip(addresses, await self._fetch_token_data(addresses)):
+            if isinstance(token_data, Exception):
+                logger.warning('Skipping %s: %r', address, token_data)
+                continue
+            results.append(self._analyze(token_data))
+        return results
+
+    def _analyze(self, token_data: Dict[str, Any]) -> Dict[str, Any]:
         analysis = {
             'rug_risk': 'low',
             'liquidity_risk': self._check_liquidity(token_data),
@@ -63,36 +202,164 @@ class SolanaDexBot:
         }
         return {**token_data, **analysis}
 
-    async def _fetch_token_data(self, address: str) -> Dict[str, Any]:
-        """Fetch token metadata and market data"""
-        async with aiohttp.ClientSession() as session:
-            # Get basic token info
-            async with session.get(
-                f"https://api.dexscreener.com/latest/dex/tokens/{address}"
-            ) as resp:
-                dexscreener_data = await resp.json()
-            
-            # Get additional chain data
-            token_info = self.client.get_account_info(address).value
-            mint_info = Token(self.client, address).get_mint_info()
-            
+    async def run_loop(self):
+        """Refresh the watchlist every poll interval, and on chain changes in between"""
+        watcher = asyncio.create_task(self._watch_accounts())
+        watcher.add_done_callback(self._log_watcher_exit)
+        try:
+            while True:
+                await self._refresh(self.config['watchlist'])
+                await asyncio.sleep(self.config['poll_interval'])
+        finally:
+            watcher.cancel()
+            # Wait out any in-flight save before the caller closes the database
+            await asyncio.gather(watcher, return_exceptions=True)
+
+    async def _refresh(self, addresses):
+        """Analyze and store one batch; failures are logged so monitoring continues"""
+        try:
+            await self.save_tokens(await self.analyze_tokens(addresses))
+        except Exception:
+            logger.exception('Refreshing %d token(s) failed', len(addresses))
+
+    async def _watch_accounts(self):
+        """Re-analyze watchlist tokens as soon as their accounts change"""
+        backoff = 1
+        while True:
+            try:
+                async with connect(self.config['ws_url']) as ws:
+                    subscriptions, changed = await self._subscribe(ws)
+                    backoff = 1
+                    if changed:
+                        await self._refresh(changed)
+                    async for msgs in ws:
+                        changed = {subscriptions[m.subscription] for m in msgs
+                                   if getattr(m, 'subscription', None) in subscriptions}
+                        if changed:
+                            await self._refresh(changed)
+            except (OSError, asyncio.TimeoutError, WebSocketException) as e:
+                # The periodic refresh keeps running while we reconnect
+                logger.warning('Account subscription dropped (%s), retrying in %ss', e, backoff)
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, self.config['poll_interval'])
+
+    @staticmethod
+    def _log_watcher_exit(task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            logger.error('Account subscriptions stopped', exc_info=task.exception())
+
+    async def _subscribe(self, ws):
+        """Subscribe to each watchlist account; returns (id -> address, already changed)"""
+        subscriptions, early = {}, set()
+        for address in self.config['watchlist']:
+            try:
+                pubkey = Pubkey.from_string(address)
+            except ValueError:
+                logger.warning('Not subscribing to invalid address %s', address)
+                continue
+            await ws.account_subscribe(pubkey, commitment=Confirmed)
+            # One subscribe is in flight at a time, so the next SubscriptionResult
+            # or SubscriptionError is its reply; anything else is a notification
+            reply = None
+            while reply is None:
+                for msg in await ws.recv():
+                    if isinstance(msg, (SubscriptionResult, SubscriptionError)):
+                        reply = msg
+                    else:
+                        early.add(getattr(msg, 'subscription', None))
+            if isinstance(reply, SubscriptionError):
+                logger.warning('Subscription for %s rejected: %s', address, reply.error)
+                continue
+            subscriptions[reply.result] = address
+        return subscriptions, {subscriptions[s] for s in early if s in subscriptions}
+
+    async def _fetch_token_data(self, addresses: list) -> list:
+        """Fetch token metadata and market data; a failed token yields its exception"""
+        async def pair_data(address):
+            async with self._fetch_slots:
+                return await self._fetch_pair_data(address)
+
+        # Market lookups and the batched chain read are independent, so overlap them
+        pairs, accounts = await asyncio.gather(
+            asyncio.gather(*(pair_data(a) for a in addresses), return_exceptions=True),
+            self._fetch_accounts(addresses)
+        )
+
+        tokens = []
+        for address, pair, account in zip(addresses, pairs, accounts):
+            try:
+                tokens.append(self._token_data(address, pair, account))
+            except Exception as e:
+                tokens.append(e)
+        return tokens
+
+    def _token_data(self, address: str, pair, account) -> Dict[str, Any]:
+        if isinstance(pair, Exception):
+            raise pair
+        if account is None:
+            raise ValueError(f"No mint account found for {address}")
+        # SPL mint layout: COption<Pubkey> mint authority at 0, freeze authority at 46.
+        # Plain mints are exactly 82 bytes; Token-2022 mints with extensions are padded
+        # past the 165-byte token account size and tagged with AccountType 1 at byte 165.
+        owner = str(account.owner)
+        data = bytes(account.data)
+        is_mint = owner in (_TOKEN_PROGRAM, _TOKEN_2022_PROGRAM) and len(data) == 82
+        if owner == _TOKEN_2022_PROGRAM and len(data) > 165:
+            is_mint = data[165] == 1
+        if not is_mint:
+            raise ValueError(f"{address} is not an SPL token mint")
         return {
             'address': address,
-            'liquidity': dexscreener_data['pairs'][0]['liquidity']['usd'],
-            'volume': dexscreener_data['pairs'][0]['volume']['h24'],
-            'creator_burns': token_info.owner.burns,
-            'program_id': str(token_info.owner),
-            'created_at': datetime.fromtimestamp(mint_info.data.timestamp)
+            'symbol': pair['baseToken']['symbol'],
+            'liquidity': pair['liquidity']['usd'],
+            'volume': pair['volume']['h24'],
+            'mint_authority': data[0:4] != b'\x00\x00\x00\x00',
+            'freeze_authority': data[46:50] != b'\x00\x00\x00\x00',
+            'program_id': owner,
+            'created_at': datetime.fromtimestamp(pair['pairCreatedAt'] / 1000)
         }
 
+    async def _fetch_accounts(self, addresses: list) -> list:
+        """Account info per address, 100 per getMultipleAccounts call; None if missing or invalid"""
+        pubkeys = {}
+        for address in addresses:
+            try:
+                pubkeys[address] = Pubkey.from_string(address)
+            except ValueError:
+                pass
+        keys = list(pubkeys.values())
+        batches = await asyncio.gather(*(
+            self.client.get_multiple_accounts(keys[i:i + 100], commitment=Confirmed)
+            for i in range(0, len(keys), 100)
+        ))
+        found = dict(zip(pubkeys, (account for batch in batches for account in batch.value)))
+        return [found.get(address) for address in addresses]
+
+    @alru_cache(maxsize=4096, ttl=300)
+    async def _fetch_pair_data(self, address: str) -> Dict[str, Any]:
+        """Top Dexscreener pair for a token, cached for one poll interval"""
+        session = await self._ensure_http()
+        async with session.get(
+            f"https://api.dexscreener.com/latest/dex/tokens/{address}"
+        ) as resp:
+            dexscreener_data = orjson.loads(await resp.read())
+        if not dexscreener_data.get('pairs'):
+            raise ValueError(f"No Dexscreener pairs for {address}")
+        return dexscreener_data['pairs'][0]
+
+    def cache_stats(self) -> Dict[str, int]:
+        info = self._fetch_pair_data.cache_info()
+        return {'hits': info.hits, 'misses': info.misses, 'size': info.currsize}
+
     def _check_liquidity(self, token: Dict[str, Any]) -> str:
         return 'high' if token['liquidity'] > self.config['risk_params']['min_liquidity'] else 'low'
 
     def _check_program_risk(self, token: Dict[str, Any]) -> str:
-        return 'verified' if token['program_id'] in self.config['dex_programs'].values() else 'unverified'
+        return 'verified' if token['program_id'] in self._verified_programs else 'unverified'
 
     def _check_creator_behavior(self, token: Dict[str, Any]) -> str:
-        if token['creator_burns'] > self.config['risk_params']['max_creator_burns']:
+        # A retained mint or freeze authority lets the creator inflate supply or lock holders
+        if token['mint_authority'] or token['freeze_authority']:
             return 'high'
         return 'low'
 
@@ -101,32 +368,32 @@ class SolanaDexBot:
         if not self.security.verify_wallet(user_wallet):
             raise Exception("Wallet verification failed")
 
-        async with aiohttp.ClientSession() as session:
-            # Get quote
-            async with session.get(
-                f"{self.config['jupiter_api']}/quote",
-                params={
-                    'inputMint': 'So11111111111111111111111111111111111111112',  # SOL
-                    'outputMint': token_in,
-                    'amount': int(amount * 1e9),
-                    'slippageBps': 100
-                }
-            ) as resp:
-                quote = await resp.json()
-
-            if not self.security.validate_quote(quote):
-                raise Exception("Invalid swap quote")
-
-            # Prepare swap
-            async with session.post(
-                f"{self.config['jupiter_api']}/swap",
-                json={
-                    'quoteResponse': quote,
-                    'userPublicKey': user_wallet,
-                    'wrapAndUnwrapSol': True
-                }
-            ) as resp:
-                swap_data = await resp.json()
+        session = await self._ensure_http()
+        # Get quote
+        async with session.get(
+            f"{self.config['jupiter_api']}/quote",
+            params={
+                'inputMint': 'So11111111111111111111111111111111111111112',  # SOL
+                'outputMint': token_in,
+                'amount': int(amount * 1e9),
+                'slippageBps': 100
+            }
+        ) as resp:
+            quote = orjson.loads(await resp.read())
+
+        if not self.security.validate_quote(quote):
+            raise Exception("Invalid swap quote")
+
+        # Prepare swap over the same keep-alive connection
+        async with session.post(
+            f"{self.config['jupiter_api']}/swap",
+            json={
+                'quoteResponse': quote,
+                'userPublicKey': user_wallet,
+                'wrapAndUnwrapSol': True
+            }
+        ) as resp:
+            swap_data = orjson.loads(await resp.read())
 
         return await self._sign_and_send(swap_data['swapTransaction'], user_wallet)
 
@@ -135,11 +402,59 @@ class SolanaDexBot:
         # In real implementation, use proper wallet integration
         return "SIMULATED_TX_ID"
 
+def create_dashboard(dex_bot: SolanaDexBot) -> Starlette:
+    """ASGI dashboard served from the bot's event loop"""
+    async def dashboard(request):
+        return JSONResponse({
+            'watchlist': dex_bot.config['watchlist'],
+            'poll_interval': dex_bot.config['poll_interval']
+        })
+
+    async def analytics(request):
+        return JSONResponse({
+            'tokens': await dex_bot.recent_tokens(),
+            'pair_cache': dex_bot.cache_stats()
+        })
+
+    return Starlette(routes=[
+        Route('/', dashboard),
+        Route('/analytics', analytics)
+    ])
+
+class _DashboardServer(uvicorn.Server):
+    """uvicorn server that leaves signal handling to PTB"""
+    def install_signal_handlers(self):
+        pass
+
+    @contextlib.contextmanager
+    def capture_signals(self):
+        yield
+
+    async def serve_quietly(self):
+        """serve() that keeps dashboard failures from stopping the bot"""
+        try:
+            await self.serve()
+        except SystemExit:
+            # uvicorn exits the process when it cannot bind its port
+            logger.error('Dashboard failed to start on port %s', self.config.port)
+
 class TelegramBot:
     def __init__(self, dex_bot: SolanaDexBot):
         self.dex_bot = dex_bot
-        self.updater = Updater(os.getenv('TG_TOKEN'), use_context=True)
-        
+        self.application = (
+            Application.builder()
+            .token(os.getenv('TG_TOKEN'))
+            .concurrent_updates(True)
+            # Token bucket in front of every outbound Bot API call
+            .rate_limiter(AIORateLimiter(overall_max_rate=30, overall_time_period=1))
+            .post_init(self._post_init)
+            .post_shutdown(self._post_shutdown)
+            .build()
+        )
+        self._monitor = None
+        self._dashboard = None
+        self._dashboard_task = None
+
         handlers = [
             CommandHandler('start', self.start),
             CommandHandler('analyze', self.analyze),
@@ -147,51 +462,94 @@ class TelegramBot:
             CallbackQueryHandler(self.button_handler)
         ]
         for handler in handlers:
-            self.updater.dispatcher.add_handler(handler)
+            self.application.add_handler(handler)
 
-    def start(self, update: Update, context: CallbackContext):
-        keyboard = [
-            [InlineKeyboardButton("🔄 SOL Swap", callback_data='swap')],
-            [InlineKeyboardButton("📈 Token Analytics", callback_data='analyze')]
-        ]
-        update.message.reply_text(
+    async def _post_init(self, application: Application):
+        await self.dex_bot.open()
+        # Monitoring runs on the same loop as update processing
+        self._monitor = asyncio.create_task(self.dex_bot.run_loop())
+        self._dashboard = _DashboardServer(uvicorn.Config(
+            create_dashboard(self.dex_bot),
+            host='0.0.0.0',
+            port=self.dex_bot.config['dashboard_port'],
+            loop='asyncio'
+        ))
+        self._dashboard_task = asyncio.create_task(self._dashboard.serve_quietly())
+
+    async def _post_shutdown(self, application: Application):
+        if self._monitor is not None:
+            self._monitor.cancel()
+        if self._dashboard is not None:
+            self._dashboard.should_exit = True
+        # Let both tasks finish before the pool and sessions close under them
+        tasks = [t for t in (self._monitor, self._dashboard_task) if t is not None]
+        for result in await asyncio.gather(*tasks, return_exceptions=True):
+            if isinstance(result, BaseException) and not isinstance(result, asyncio.CancelledError):
+                logger.error('Background task failed', exc_info=result)
+        await self.dex_bot.close()
+
+    async def start(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        await update.message.reply_text(
             '🔹 Solana DexBot Interface',
-            reply_markup=InlineKeyboardMarkup(keyboard)
+            reply_markup=_START_MARKUP
         )
 
-    def analyze(self, update: Update, context: CallbackContext):
+    async def analyze(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         if not context.args:
-            update.message.reply_text("Usage: /analyze [TOKEN_ADDRESS]")
+            await update.message.reply_text("Usage: /analyze [TOKEN_ADDRESS]")
             return
-            
+
         token_address = context.args[0]
-        analysis = asyncio.run(self.dex_bot.analyze_token(token_address))
-        
+        try:
+            analysis = await self.dex_bot.analyze_token(token_address)
+        except Exception as e:
+            await update.message.reply_text(f"❌ Error: {str(e)}")
+            return
+
         report = f"🔍 Analysis for {token_address}:\n" \
                  f"• Liquidity: ${analysis['liquidity']:,.2f}\n" \
                  f"• Program Risk: {analysis['program_risk'].upper()}\n" \
                  f"• Creator Risk: {analysis['creator_risk'].upper()}\n" \
                  f"• Overall Safety: {analysis['rug_risk'].upper()}"
-        
-        update.message.reply_text(report)
 
-    def buy(self, update: Update, context: CallbackContext):
+        await update.message.reply_text(report)
+
+    async def buy(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         if len(context.args) < 2:
-            update.message.reply_text("Usage: /buy [TOKEN_ADDRESS] [SOL_AMOUNT]")
+            await update.message.reply_text("Usage: /buy [TOKEN_ADDRESS] [SOL_AMOUNT]")
             return
-            
+
         token_address = context.args[0]
         amount = float(context.args[1])
-        
+
+        # Run the swap as a task on the running loop so the handler returns at once
+        await update.message.reply_text("⏳ Swap submitted...")
+        context.application.create_task(
+            self._run_swap(update, token_address, amount), update=update
+        )
+
+    async def _run_swap(self, update: Update, token_address: str, amount: float):
         try:
-            tx_id = asyncio.run(self.dex_bot.execute_swap(
+            tx_id = await self.dex_bot.execute_swap(
                 user_wallet=str(update.message.chat_id),
                 token_in=token_address,
                 amount=amount
-            ))
-            update.message.reply_text(f"✅ Swap executed! TX ID: {tx_id}")
+            )
+            await update.message.reply_text(f"✅ Swap executed! TX ID: {tx_id}")
         except Exception as e:
-            update.message.reply_text(f"❌ Error: {str(e)}")
+            await update.message.reply_text(f"❌ Error: {str(e)}")
+
+    async def button_handler(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        query = update.callback_query
+        await query.answer()
+
+        if query.data == 'swap':
+            await query.message.reply_text("Usage: /buy [TOKEN_ADDRESS] [SOL_AMOUNT]")
+        elif query.data == 'analyze':
+            await query.message.reply_text(
+                "Usage: /analyze [TOKEN_ADDRESS]",
+                reply_markup=_ANALYTICS_MARKUP
+            )
 
 class SecurityManager:
     def __init__(self):
@@ -200,8 +558,8 @@ class SecurityManager:
     def _load_blacklist(self):
         # Would load from external source in production
         return {
-            'HoneyPotTokens': set(),
-            'KnownScamWallets': set()
+            'HoneyPotTokens': frozenset(),
+            'KnownScamWallets': frozenset()
         }
     
     def verify_wallet(self, wallet: str) -> bool:
@@ -217,10 +575,6 @@ class SecurityManager:
 if __name__ == "__main__":
     bot = SolanaDexBot()
     tg_bot = TelegramBot(bot)
-    
-    tg_bot.updater.start_polling()
-    
-    # Monitoring loop
-    while True:
-        # Would implement actual monitoring logic
-        time.sleep(300)
+
+    # Telegram polling, the dashboard and the monitoring loop share one event loop
+    tg_bot.application.run_polling(close_loop=False)